@@ -5,14 +5,19 @@ Filler Words Detector Bot package.
 from .telegram_filler_bot import TelegramFillerBot
 from .filler_detector import FillerWordsDetector
 from .database import FillerWordsDatabase
-from .messages import Messages
-from .chat_state import ChatStateManager, ChatState
+from .chat_state import (
+    ChatStateManager,
+    SQLiteChatStateManager,
+    ChatState,
+    ManagedChatState,
+)
 
 __all__ = [
     "TelegramFillerBot",
     "FillerWordsDetector",
     "FillerWordsDatabase",
-    "Messages",
     "ChatStateManager",
+    "SQLiteChatStateManager",
     "ChatState",
+    "ManagedChatState",
 ]
@@ -1,17 +1,56 @@
 """
 Chat state management for the Telegram Filler Words Bot.
-Stores per-chat settings in memory.
+Stores per-chat settings in memory, optionally persisted to the database.
 """
 
-from typing import Dict
+from dataclasses import dataclass
 
+from bot.database import FillerWordsDatabase
 
+
+@dataclass(slots=True)
 class ChatState:
     """State for a single chat."""
 
-    def __init__(self):
-        """Initialize chat state with default values."""
-        self.is_active: bool = False
+    is_active: bool = False
+
+    def toggle_active(self) -> bool:
+        """Toggle the active state and return the new state."""
+        self.is_active = not self.is_active
+        return self.is_active
+
+    def set_active(self, active: bool) -> None:
+        """Set the active state."""
+        self.is_active = active
+
+
+class ManagedChatState:
+    """State of a chat in a ChatStateManager, reading and writing through it."""
+
+    __slots__ = ("_manager", "_chat_id")
+
+    def __init__(self, manager: "ChatStateManager", chat_id: int):
+        """
+        Bind the state to a chat in a manager.
+
+        Args:
+            manager: The manager holding the chat's state
+            chat_id: The Telegram chat ID
+        """
+        self._manager = manager
+        self._chat_id = chat_id
+
+    def __repr__(self) -> str:
+        return f"ManagedChatState(chat_id={self._chat_id})"
+
+    @property
+    def is_active(self) -> bool:
+        """Whether the bot is active in the chat."""
+        return self._manager.is_active(self._chat_id)
+
+    @is_active.setter
+    def is_active(self, active: bool) -> None:
+        self._manager.set_active(self._chat_id, active)
 
     def toggle_active(self) -> bool:
         """Toggle the active state and return the new state."""
@@ -24,30 +63,74 @@ class ChatState:
 
 
 class ChatStateManager:
-    """Manages state for all chats."""
+    """Manages state for all chats, in memory only."""
 
     def __init__(self):
-        """Initialize the state manager."""
-        self._states: Dict[int, ChatState] = {}
+        """Initialize the state manager with no active chats."""
+        # IDs of chats the bot is active in; every other chat is inactive
+        self._active: set[int] = set()
 
-    def get_state(self, chat_id: int) -> ChatState:
+    def get_state(self, chat_id: int) -> ManagedChatState:
         """
-        Get the state for a chat, creating it if it doesn't exist.
+        Get the state for a chat.
 
         Args:
             chat_id: The Telegram chat ID
 
         Returns:
-            The ChatState for this chat
+            The state of this chat; changes to it are applied (and, for
+            SQLiteChatStateManager, persisted) through this manager
         """
-        if chat_id not in self._states:
-            self._states[chat_id] = ChatState()
-        return self._states[chat_id]
+        return ManagedChatState(self, chat_id)
 
     def is_active(self, chat_id: int) -> bool:
         """Check if the bot is active in a chat."""
-        return self.get_state(chat_id).is_active
+        return chat_id in self._active
 
-    def set_active(self, chat_id: int, active: bool) -> None:
-        """Set whether the bot is active in a chat."""
-        self.get_state(chat_id).set_active(active)
+    def set_active(self, chat_id: int, active: bool) -> bool:
+        """
+        Set whether the bot is active in a chat.
+
+        Args:
+            chat_id: The Telegram chat ID
+            active: Whether the bot should be active in the chat
+
+        Returns:
+            True if the state was changed successfully, False otherwise
+        """
+        if active:
+            self._active.add(chat_id)
+        else:
+            self._active.discard(chat_id)
+        return True
+
+
+class SQLiteChatStateManager(ChatStateManager):
+    """Chat state manager that persists active chats to the database."""
+
+    def __init__(self, database: FillerWordsDatabase):
+        """
+        Initialize the state manager, loading the active chats.
+
+        Args:
+            database: Database to load and persist active chats with
+        """
+        super().__init__()
+        self._database = database
+        self._active.update(database.load_active_chats())
+
+    def set_active(self, chat_id: int, active: bool) -> bool:
+        """
+        Set whether the bot is active in a chat, persisting the change first.
+
+        Args:
+            chat_id: The Telegram chat ID
+            active: Whether the bot should be active in the chat
+
+        Returns:
+            True if the state was saved and changed, False (leaving it unchanged)
+            if saving failed
+        """
+        if not self._database.save_chat_state(chat_id, active):
+            return False
+        return super().set_active(chat_id, active)
@@ -3,14 +3,56 @@ Database management for filler words tracking using SQLite.
 """
 
 import sqlite3
+import threading
+from collections import Counter, deque
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Iterable, Mapping, Optional
 import logging
 
+from bot.stats_cache import TTLCache
+
+
+USAGE_TABLE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS filler_words_usage (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        chat_id INTEGER NOT NULL,
+        word_id INTEGER NOT NULL REFERENCES words(id),
+        timestamp INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
+    )
+"""
+
 
 class FillerWordsDatabase:
     """SQLite database for tracking filler words usage."""
 
+    # Connection tuning: WAL lets /stats readers run alongside inserts and
+    # synchronous=NORMAL is durable in WAL mode while fsyncing far less often.
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-65536",
+        "PRAGMA mmap_size=268435456",
+        "PRAGMA busy_timeout=30000",
+    )
+
+    # Seconds for which stats results are served from memory, and how many
+    # (user, chat) results are kept
+    STATS_CACHE_TTL = 30
+    STATS_CACHE_SIZE = 512
+
+    # Recorded usages are buffered and written in one transaction once this
+    # many are pending, or after FLUSH_INTERVAL seconds, whichever comes first
+    FLUSH_SIZE = 100
+    FLUSH_INTERVAL = 1.0
+    # Consecutive flushes failing on a busy or locked database before the
+    # pending usage is dropped
+    FLUSH_RETRIES = 5
+
+    # Rows per multi-row INSERT, keeping under SQLite's 999 bound parameters
+    INSERT_BATCH_ROWS = 999 // 4
+
     def __init__(self, db_path: str = "filler_words.db"):
         """
         Initialize the database connection.
@@ -20,37 +62,191 @@ class FillerWordsDatabase:
         """
         self.db_path = db_path
         self.logger = logging.getLogger(self.__class__.__name__)
+        # A single connection is reused across calls (and bot threads) so that
+        # SQLite keeps its page cache warm; the lock serializes access to it.
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.RLock()
+        # Cache of word -> words.id, filled at startup and as new words appear
+        self._word_ids: dict[str, int] = {}
+        # (user_id, chat_id) -> stats
+        self._stats_cache = TTLCache(self.STATS_CACHE_SIZE, self.STATS_CACHE_TTL)
+        # Pending (user_id, chat_id, word, timestamp) rows, guarded by their own
+        # lock so recording never waits for a write in progress.
+        self._pending: deque[tuple[int, int, str, int]] = deque()
+        self._pending_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flush_failures = 0
+        self._closed = False
         self._init_database()
 
+    def close(self) -> None:
+        """Write any pending usage and close the database connection."""
+        with self._lock:
+            with self._pending_lock:
+                self._closed = True
+            if not self.flush():
+                self.logger.error(
+                    "Closing with %s filler words not written", len(self._pending)
+                )
+            self._conn.close()
+
     def _init_database(self) -> None:
         """Initialize the database schema."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock, self._conn as conn:
             cursor = conn.cursor()
+            for pragma in self.PRAGMAS:
+                cursor.execute(pragma)
+            # Dictionary of filler words, referenced by ID from the other tables
             cursor.execute(
                 """
-                CREATE TABLE IF NOT EXISTS filler_words_usage (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    chat_id INTEGER NOT NULL,
-                    word TEXT NOT NULL,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+                CREATE TABLE IF NOT EXISTS words (
+                    id INTEGER PRIMARY KEY,
+                    word TEXT UNIQUE NOT NULL
                 )
                 """
             )
-            # Create indexes for faster queries
+            if "word" in self._table_columns(cursor, "filler_words_usage"):
+                self._migrate_usage_to_word_ids(cursor)
+            cursor.execute(USAGE_TABLE_SCHEMA)
+            cursor.execute("PRAGMA user_version")
+            if cursor.fetchone()[0] < 1:
+                self._migrate_timestamps_to_epoch(cursor)
+                cursor.execute("PRAGMA user_version = 1")
+            # Create indexes for faster queries. The stats index covers every
+            # column the windowed queries read, so they never touch the table.
+            cursor.execute("DROP INDEX IF EXISTS idx_user_chat")
             cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_user_chat ON filler_words_usage(user_id, chat_id)"
+                """
+                CREATE INDEX IF NOT EXISTS idx_stats_cov
+                ON filler_words_usage(user_id, chat_id, timestamp, word_id)
+                """
             )
             cursor.execute(
                 "CREATE INDEX IF NOT EXISTS idx_timestamp ON filler_words_usage(timestamp)"
             )
+            # Rollup of per-word counts, so all-time stats don't scan the history
+            has_counts = bool(self._table_columns(cursor, "filler_word_counts"))
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS filler_word_counts (
+                    user_id INTEGER NOT NULL,
+                    chat_id INTEGER NOT NULL,
+                    word_id INTEGER NOT NULL REFERENCES words(id),
+                    count INTEGER NOT NULL,
+                    PRIMARY KEY (user_id, chat_id, word_id)
+                ) WITHOUT ROWID
+                """
+            )
+            if not has_counts:
+                # Backfill the rollup from usage recorded before it existed
+                cursor.execute(
+                    """
+                    INSERT INTO filler_word_counts (user_id, chat_id, word_id, count)
+                    SELECT user_id, chat_id, word_id, COUNT(*) FROM filler_words_usage
+                    GROUP BY user_id, chat_id, word_id
+                    """
+                )
+            # Chats the bot is active in, so /start survives restarts
+            cursor.execute(
+                "CREATE TABLE IF NOT EXISTS active_chats (chat_id INTEGER PRIMARY KEY)"
+            )
+            conn.commit()
+            cursor.execute("SELECT word, id FROM words")
+            self._word_ids = dict(cursor.fetchall())
+            self.logger.info("Database initialized at %s", self.db_path)
+
+    @staticmethod
+    def _table_columns(cursor: sqlite3.Cursor, table: str) -> set[str]:
+        """Get the column names of a table (empty if it doesn't exist)."""
+        cursor.execute(f"PRAGMA table_info({table})")
+        return {row[1] for row in cursor.fetchall()}
+
+    def _migrate_usage_to_word_ids(self, cursor: sqlite3.Cursor) -> None:
+        """Rewrite a usage table storing word text to reference the words table."""
+        self.logger.info("Migrating filler_words_usage to the words dictionary")
+        cursor.execute(
+            "INSERT OR IGNORE INTO words (word) SELECT DISTINCT word FROM filler_words_usage"
+        )
+        cursor.execute("DROP INDEX IF EXISTS idx_timestamp")
+        cursor.execute(
+            "ALTER TABLE filler_words_usage RENAME TO filler_words_usage_legacy"
+        )
+        cursor.execute(USAGE_TABLE_SCHEMA)
+        cursor.execute(
+            """
+            INSERT INTO filler_words_usage (id, user_id, chat_id, word_id, timestamp)
+            SELECT u.id, u.user_id, u.chat_id, w.id, COALESCE(u.timestamp, 0)
+            FROM filler_words_usage_legacy u JOIN words w ON w.word = u.word
+            """
+        )
+        cursor.execute("DROP TABLE filler_words_usage_legacy")
+
+    def _migrate_timestamps_to_epoch(self, cursor: sqlite3.Cursor) -> None:
+        """Convert ISO timestamps (naive local time) to integer unix seconds."""
+        cursor.execute(
+            """
+            UPDATE filler_words_usage
+            SET timestamp = CAST(strftime('%s', timestamp, 'utc') AS INTEGER)
+            WHERE typeof(timestamp) = 'text'
+            AND strftime('%s', timestamp, 'utc') IS NOT NULL
+            """
+        )
+        if cursor.rowcount > 0:
+            self.logger.info("Converted %s timestamps to unix time", cursor.rowcount)
+        # Unparseable timestamps would violate NOT NULL; keep the usage in the
+        # all-time counts but outside every recent period
+        cursor.execute(
+            """
+            UPDATE filler_words_usage SET timestamp = 0
+            WHERE typeof(timestamp) NOT IN ('integer', 'real')
+            """
+        )
+        if cursor.rowcount > 0:
+            self.logger.warning(
+                "Set %s unparseable timestamps to the unix epoch", cursor.rowcount
+            )
+
+    def register_words(self, words: Iterable[str]) -> None:
+        """
+        Make sure the given words have dictionary IDs.
+
+        Args:
+            words: Lowercase filler words to register (e.g. the detector's vocabulary)
+        """
+        with self._lock, self._conn as conn:
+            word_ids = self._lookup_word_ids(conn.cursor(), set(words))
             conn.commit()
-            self.logger.info(f"Database initialized at {self.db_path}")
+            self._word_ids.update(word_ids)
+
+    def _lookup_word_ids(
+        self, cursor: sqlite3.Cursor, words: Iterable[str]
+    ) -> dict[str, int]:
+        """
+        Get dictionary IDs for words, inserting any that are missing.
+
+        The caller must commit before adding the result to the ID cache.
+
+        Args:
+            cursor: Cursor of the current transaction
+            words: Lowercase filler words
+
+        Returns:
+            Dictionary mapping each word to its ID
+        """
+        word_ids = {}
+        for word in words:
+            word_id = self._word_ids.get(word)
+            if word_id is None:
+                cursor.execute("INSERT OR IGNORE INTO words (word) VALUES (?)", (word,))
+                cursor.execute("SELECT id FROM words WHERE word = ?", (word,))
+                word_id = cursor.fetchone()[0]
+            word_ids[word] = word_id
+        return word_ids
 
     @staticmethod
-    def _to_iso_string(timestamp: datetime) -> str:
-        """Convert datetime to ISO format string for SQLite compatibility."""
-        return timestamp.isoformat() if isinstance(timestamp, datetime) else timestamp
+    def _to_epoch(timestamp: datetime) -> int:
+        """Convert datetime to unix seconds, as stored in the timestamp column."""
+        return int(timestamp.timestamp())
 
     def record_filler_word(
         self,
@@ -65,103 +261,323 @@ class FillerWordsDatabase:
         Args:
             user_id: Telegram user ID
             chat_id: Telegram chat ID
-            word: The filler word used
+            word: The filler word used (lowercase, as emitted by the detector)
             timestamp: Optional timestamp (defaults to now)
 
         Returns:
-            True if recorded successfully, False otherwise
+            True once the usage is queued for writing, False if the database
+            has been closed
+        """
+        return self.record_filler_words(user_id, chat_id, {word: 1}, timestamp)
+
+    def record_filler_words(
+        self,
+        user_id: int,
+        chat_id: int,
+        counts: Mapping[str, int],
+        timestamp: Optional[datetime] = None,
+    ) -> bool:
+        """
+        Record several filler word usages.
+
+        The usages are buffered and written together with other pending usages
+        by flush(), which runs once FLUSH_SIZE rows are pending, after
+        FLUSH_INTERVAL seconds, before any read and on close().
+
+        Args:
+            user_id: Telegram user ID
+            chat_id: Telegram chat ID
+            counts: Number of uses of each lowercase filler word (e.g. a Counter)
+            timestamp: Optional timestamp shared by all words (defaults to now)
+
+        Returns:
+            True once the usages are queued for writing, False if the database
+            has been closed (the usages are dropped)
         """
         if timestamp is None:
             timestamp = datetime.now()
+        epoch = self._to_epoch(timestamp)
+
+        with self._pending_lock:
+            if self._closed:
+                # e.g. messages still being handled while the bot shuts down
+                self.logger.warning(
+                    "Database closed, dropping filler words from user %s in chat %s",
+                    user_id,
+                    chat_id,
+                )
+                return False
+            for word, count in counts.items():
+                self._pending.extend([(user_id, chat_id, word, epoch)] * count)
+            pending_count = len(self._pending)
+            if 0 < pending_count < self.FLUSH_SIZE:
+                self._schedule_flush()
+
+        if pending_count >= self.FLUSH_SIZE:
+            self.flush()
+        return True
+
+    def _schedule_flush(self) -> None:
+        """Start the flush timer unless it is already running (hold _pending_lock)."""
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(
+                self.FLUSH_INTERVAL, self._flush_on_timer
+            )
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _flush_on_timer(self) -> None:
+        """Flush from the timer thread, unless the database was closed meanwhile."""
+        with self._lock:
+            if not self._closed:
+                self.flush()
+
+    def _requeue(self, rows: list[tuple[int, int, str, int]]) -> None:
+        """Put rows that failed to be written back at the front of the queue."""
+        with self._pending_lock:
+            self._pending.extendleft(reversed(rows))
+            if not self._closed:
+                self._schedule_flush()
+
+    def flush(self) -> bool:
+        """
+        Write all pending filler word usages in a single transaction.
 
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+        If the database is busy or locked, the usages are queued again and
+        retried by the next flush, up to FLUSH_RETRIES times. Usages that can't
+        be written for any other reason are logged and dropped, so they don't
+        hold up the rest.
+
+        Returns:
+            True if written successfully (or nothing was pending), False otherwise
+        """
+        with self._lock:
+            with self._pending_lock:
+                rows = list(self._pending)
+                self._pending.clear()
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+            if not rows:
+                return True
+
+            try:
+                self._write_rows(rows)
+                self._flush_failures = 0
+                return True
+            except sqlite3.OperationalError as e:
+                self._flush_failures += 1
+                if self._flush_failures < self.FLUSH_RETRIES:
+                    self.logger.warning(
+                        "Error writing %s filler words, will retry: %s", len(rows), e
+                    )
+                    self._requeue(rows)
+                else:
+                    self.logger.error(
+                        "Dropping %s filler words after %s failed writes: %s",
+                        len(rows),
+                        self._flush_failures,
+                        e,
+                    )
+                    self._flush_failures = 0
+                return False
+            except Exception as e:
+                self.logger.error("Error recording filler words: %s", e)
+                self._write_valid_rows(rows)
+                return False
+            finally:
+                for user_id, chat_id in {(row[0], row[1]) for row in rows}:
+                    self._invalidate_stats(chat_id, user_id)
+
+    def _write_rows(self, rows: list[tuple[int, int, str, int]]) -> None:
+        """
+        Write usage rows and update the rollup in a single transaction.
+
+        Args:
+            rows: (user_id, chat_id, word, timestamp) rows to write
+        """
+        counts = Counter((user_id, chat_id, word) for user_id, chat_id, word, _ in rows)
+        with self._conn as conn:
+            cursor = conn.cursor()
+            word_ids = self._lookup_word_ids(cursor, {word for _, _, word in counts})
+            for start in range(0, len(rows), self.INSERT_BATCH_ROWS):
+                batch = rows[start : start + self.INSERT_BATCH_ROWS]
+                placeholders = ", ".join(["(?, ?, ?, ?)"] * len(batch))
+                params = []
+                for user_id, chat_id, word, epoch in batch:
+                    params.extend((user_id, chat_id, word_ids[word], epoch))
                 cursor.execute(
-                    """
-                    INSERT INTO filler_words_usage (user_id, chat_id, word, timestamp)
-                    VALUES (?, ?, ?, ?)
-                    """,
-                    (user_id, chat_id, word.lower(), self._to_iso_string(timestamp)),
+                    "INSERT INTO filler_words_usage "
+                    "(user_id, chat_id, word_id, timestamp) "
+                    f"VALUES {placeholders}",
+                    params,
                 )
-                conn.commit()
-                return True
-        except sqlite3.IntegrityError as e:
-            self.logger.warning(
-                f"Database integrity error for user {user_id} in chat {chat_id}: {word} - {e}"
+            cursor.executemany(
+                """
+                INSERT INTO filler_word_counts (user_id, chat_id, word_id, count)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (user_id, chat_id, word_id)
+                DO UPDATE SET count = count + excluded.count
+                """,
+                [
+                    (user_id, chat_id, word_ids[word], count)
+                    for (user_id, chat_id, word), count in counts.items()
+                ],
             )
-            return False
-        except Exception as e:
-            self.logger.error(f"Error recording filler word: {e}")
-            return False
+            conn.commit()
+        self._word_ids.update(word_ids)
+
+    def _write_valid_rows(self, rows: list[tuple[int, int, str, int]]) -> None:
+        """
+        Write rows grouped by (user, chat, word), dropping the groups that fail.
+
+        Args:
+            rows: (user_id, chat_id, word, timestamp) rows to write
+        """
+        groups: dict[tuple, list] = {}
+        for row in rows:
+            groups.setdefault(row[:3], []).append(row)
+        for (user_id, chat_id, word), group in groups.items():
+            try:
+                self._write_rows(group)
+            except Exception as e:
+                self.logger.error(
+                    "Dropping %s uses of %r by user %s in chat %s: %s",
+                    len(group),
+                    word,
+                    user_id,
+                    chat_id,
+                    e,
+                )
+
+    def _invalidate_stats(self, chat_id: int, user_id: Optional[int] = None) -> None:
+        """
+        Drop cached statistics for a chat, or for a single user in it.
+
+        Args:
+            chat_id: Telegram chat ID
+            user_id: Optional Telegram user ID (defaults to all users in the chat)
+        """
+        self._stats_cache.invalidate(
+            lambda key: key[1] == chat_id and (user_id is None or key[0] == user_id)
+        )
+
+    @staticmethod
+    def _period_starts(now: datetime) -> tuple[datetime, datetime]:
+        """Get the start of today and the start of the last 30 days."""
+        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        return today_start, now - timedelta(days=30)
 
-    def _get_total_count(
-        self, user_id: int, chat_id: int, since: Optional[datetime] = None
-    ) -> int:
+    def _get_combined_stats(
+        self,
+        user_id: int,
+        chat_id: int,
+        today_start: datetime,
+        thirty_days_ago: datetime,
+    ) -> dict:
         """
-        Get total count of filler words for a user in a specific chat.
+        Get per-word counts for all periods with a single query.
+
+        All-time counts come from the rollup, daily and monthly counts from one
+        aggregation over the last 30 days of usage.
 
         Args:
             user_id: Telegram user ID
             chat_id: Telegram chat ID
-            since: Optional datetime to filter records from (inclusive)
+            today_start: Start of the daily period
+            thirty_days_ago: Start of the monthly period
 
         Returns:
-            Total count of filler words
+            Dictionary with 'totals' per period and the ordered 'breakdown'
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock, self._conn as conn:
             cursor = conn.cursor()
-            query = """
-                SELECT COUNT(*) FROM filler_words_usage
-                WHERE user_id = ? AND chat_id = ? AND (? IS NULL OR timestamp >= ?)
-            """
-            since_str = self._to_iso_string(since) if since else None
-            cursor.execute(query, (user_id, chat_id, since_str, since_str))
-            return cursor.fetchone()[0]
+            cursor.execute(
+                """
+                SELECT w.word, COALESCE(r.daily, 0), COALESCE(r.monthly, 0), c.count
+                FROM filler_word_counts c
+                JOIN words w ON w.id = c.word_id
+                LEFT JOIN (
+                    SELECT word_id, SUM(timestamp >= ?) AS daily, COUNT(*) AS monthly
+                    FROM filler_words_usage
+                    WHERE user_id = ? AND chat_id = ? AND timestamp >= ?
+                    GROUP BY word_id
+                ) r ON r.word_id = c.word_id
+                WHERE c.user_id = ? AND c.chat_id = ?
+                ORDER BY c.count DESC, w.word
+                """,
+                (
+                    self._to_epoch(today_start),
+                    user_id,
+                    chat_id,
+                    self._to_epoch(thirty_days_ago),
+                    user_id,
+                    chat_id,
+                ),
+            )
+            breakdown = cursor.fetchall()
+        return {
+            "totals": {
+                "daily": sum(row[1] for row in breakdown),
+                "monthly": sum(row[2] for row in breakdown),
+                "all_time": sum(row[3] for row in breakdown),
+            },
+            "breakdown": breakdown,
+        }
 
-    def _get_word_breakdown(
-        self, user_id: int, chat_id: int, since: Optional[datetime] = None
-    ) -> list:
+    def get_all_stats(self, user_id: int, chat_id: int) -> dict:
         """
-        Get word breakdown statistics for a user in a specific chat.
+        Get daily, monthly and all-time statistics for a user in a specific chat.
 
         Args:
             user_id: Telegram user ID
             chat_id: Telegram chat ID
-            since: Optional datetime to filter records from (inclusive)
 
         Returns:
-            List of tuples (word, count) ordered by count descending
+            Dictionary with 'totals' (mapping 'daily', 'monthly' and 'all_time' to
+            counts) and 'breakdown', a list of (word, daily, monthly, all_time)
+            tuples ordered by all-time count descending
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            query = """
-                SELECT word, COUNT(*) as count FROM filler_words_usage
-                WHERE user_id = ? AND chat_id = ? AND (? IS NULL OR timestamp >= ?)
-                GROUP BY word
-                ORDER BY count DESC
-            """
-            since_str = self._to_iso_string(since) if since else None
-            cursor.execute(query, (user_id, chat_id, since_str, since_str))
-            return cursor.fetchall()
+        key = (user_id, chat_id)
+        with self._lock:
+            # Pending usage would make the stats stale; writing it also drops
+            # the affected cache entries
+            self.flush()
+            stats = self._stats_cache.get(key)
+            if stats is None:
+                today_start, thirty_days_ago = self._period_starts(datetime.now())
+                stats = self._get_combined_stats(
+                    user_id, chat_id, today_start, thirty_days_ago
+                )
+                self._stats_cache.set(key, stats)
+            return stats
 
-    def _get_stats(
-        self, user_id: int, chat_id: int, since: Optional[datetime] = None
-    ) -> dict:
+    def _get_period_stats(self, user_id: int, chat_id: int, column: int) -> dict:
         """
-        Get statistics for a user in a specific chat, optionally filtered by time.
+        Get statistics for one period from the combined statistics.
 
         Args:
             user_id: Telegram user ID
             chat_id: Telegram chat ID
-            since: Optional datetime to filter records from (inclusive)
+            column: Index of the period's count in the breakdown rows (1 = daily,
+                2 = monthly, 3 = all-time)
 
         Returns:
-            Dictionary with 'total' count and 'breakdown' list of (word, count) tuples
+            Dictionary with 'total' count and 'breakdown' list of (word, count)
+            tuples ordered by count descending
         """
+        breakdown = sorted(
+            (
+                (row[0], row[column])
+                for row in self.get_all_stats(user_id, chat_id)["breakdown"]
+                if row[column]
+            ),
+            key=lambda item: item[1],
+            reverse=True,
+        )
         return {
-            "total": self._get_total_count(user_id, chat_id, since),
-            "breakdown": self._get_word_breakdown(user_id, chat_id, since),
+            "total": sum(count for _, count in breakdown),
+            "breakdown": breakdown,
         }
 
     def get_stats_all_time(self, user_id: int, chat_id: int) -> dict:
@@ -175,7 +591,7 @@ class FillerWordsDatabase:
         Returns:
             Dictionary with statistics
         """
-        return self._get_stats(user_id, chat_id)
+        return self._get_period_stats(user_id, chat_id, 3)
 
     def get_stats_monthly(self, user_id: int, chat_id: int) -> dict:
         """
@@ -188,8 +604,7 @@ class FillerWordsDatabase:
         Returns:
             Dictionary with statistics
         """
-        since = datetime.now() - timedelta(days=30)
-        return self._get_stats(user_id, chat_id, since)
+        return self._get_period_stats(user_id, chat_id, 2)
 
     def get_stats_daily(self, user_id: int, chat_id: int) -> dict:
         """
@@ -202,8 +617,24 @@ class FillerWordsDatabase:
         Returns:
             Dictionary with statistics
         """
-        since = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        return self._get_stats(user_id, chat_id, since)
+        return self._get_period_stats(user_id, chat_id, 1)
+
+    def _discard_pending(self, chat_id: int, user_id: Optional[int] = None) -> None:
+        """
+        Drop pending usage for a chat, or for a single user in it.
+
+        Args:
+            chat_id: Telegram chat ID
+            user_id: Optional Telegram user ID (defaults to all users in the chat)
+        """
+        with self._pending_lock:
+            kept = [
+                row
+                for row in self._pending
+                if row[1] != chat_id or (user_id is not None and row[0] != user_id)
+            ]
+            self._pending.clear()
+            self._pending.extend(kept)
 
     def reset_user_stats(self, user_id: int, chat_id: int) -> bool:
         """
@@ -217,7 +648,9 @@ class FillerWordsDatabase:
             True if reset successfully, False otherwise
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock, self._conn as conn:
+                # Pending usage is reset too, so it can't be written afterwards
+                self._discard_pending(chat_id, user_id)
                 cursor = conn.cursor()
                 cursor.execute(
                     """
@@ -226,14 +659,25 @@ class FillerWordsDatabase:
                     """,
                     (user_id, chat_id),
                 )
-                conn.commit()
                 rows_deleted = cursor.rowcount
+                cursor.execute(
+                    """
+                    DELETE FROM filler_word_counts
+                    WHERE user_id = ? AND chat_id = ?
+                    """,
+                    (user_id, chat_id),
+                )
+                conn.commit()
+                self._invalidate_stats(chat_id, user_id)
                 self.logger.info(
-                    f"Reset stats for user {user_id} in chat {chat_id} ({rows_deleted} rows deleted)"
+                    "Reset stats for user %s in chat %s (%s rows deleted)",
+                    user_id,
+                    chat_id,
+                    rows_deleted,
                 )
                 return True
         except Exception as e:
-            self.logger.error(f"Error resetting user stats: {e}")
+            self.logger.error("Error resetting user stats: %s", e)
             return False
 
     def reset_chat_stats(self, chat_id: int) -> bool:
@@ -247,7 +691,9 @@ class FillerWordsDatabase:
             True if reset successfully, False otherwise
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock, self._conn as conn:
+                # Pending usage is reset too, so it can't be written afterwards
+                self._discard_pending(chat_id)
                 cursor = conn.cursor()
                 cursor.execute(
                     """
@@ -256,12 +702,63 @@ class FillerWordsDatabase:
                     """,
                     (chat_id,),
                 )
-                conn.commit()
                 rows_deleted = cursor.rowcount
+                cursor.execute(
+                    """
+                    DELETE FROM filler_word_counts
+                    WHERE chat_id = ?
+                    """,
+                    (chat_id,),
+                )
+                conn.commit()
+                self._invalidate_stats(chat_id)
                 self.logger.info(
-                    f"Reset stats for entire chat {chat_id} ({rows_deleted} rows deleted)"
+                    "Reset stats for entire chat %s (%s rows deleted)",
+                    chat_id,
+                    rows_deleted,
                 )
                 return True
         except Exception as e:
-            self.logger.error(f"Error resetting chat stats: {e}")
+            self.logger.error("Error resetting chat stats: %s", e)
+            return False
+
+    def load_active_chats(self) -> set[int]:
+        """
+        Load the IDs of the chats the bot is active in.
+
+        Returns:
+            Set of chat IDs
+        """
+        with self._lock, self._conn as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT chat_id FROM active_chats")
+            return {chat_id for (chat_id,) in cursor}
+
+    def save_chat_state(self, chat_id: int, active: bool) -> bool:
+        """
+        Persist whether the bot is active in a chat.
+
+        Args:
+            chat_id: Telegram chat ID
+            active: Whether the bot is active in the chat
+
+        Returns:
+            True if saved successfully, False otherwise
+        """
+        try:
+            with self._lock, self._conn as conn:
+                cursor = conn.cursor()
+                if active:
+                    cursor.execute(
+                        "INSERT OR IGNORE INTO active_chats (chat_id) VALUES (?)",
+                        (chat_id,),
+                    )
+                else:
+                    cursor.execute(
+                        "DELETE FROM active_chats WHERE chat_id = ?", (chat_id,)
+                    )
+                conn.commit()
+                return True
+        except Exception as e:
+            self.logger.error("Error saving chat state: %s", e)
             return False
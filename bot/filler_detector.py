@@ -3,22 +3,76 @@ Filler words detection module.
 """
 
 import re
+from functools import lru_cache
+from typing import Collection
+
+try:
+    import ahocorasick
+except ImportError:  # Optional dependency, fall back to the compiled regex
+    ahocorasick = None
+
+# Runs of word characters, i.e. the text between two \b boundaries
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _is_word_char(char: str) -> bool:
+    """Check if a character is a regex word character (alphanumeric or underscore)."""
+    return char.isalnum() or char == "_"
+
+
+def _is_boundary(text: str, index: int) -> bool:
+    """Check if there is a word boundary at the given index of the text."""
+    before = index > 0 and _is_word_char(text[index - 1])
+    after = index < len(text) and _is_word_char(text[index])
+    return before != after
 
 
 class FillerWordsDetector:
     """Detector for filler words in text messages."""
 
-    def __init__(self, filler_words: list[str]):
+    # Number of distinct message texts to memoize detection results for
+    CACHE_SIZE = 4096
+
+    def __init__(self, filler_words: Collection[str]):
         """
         Initialize the filler words detector.
 
         Args:
-            filler_words: List of filler words to detect (case-insensitive)
+            filler_words: Filler words to detect (case-insensitive)
         """
         self.filler_words = [
             word.lower().strip() for word in filler_words if word.strip()
         ]
 
+        # Compile all filler words into a single alternation so each message is
+        # scanned once. Longer words come first so that phrases win over their
+        # prefixes. Word boundaries prevent matching "like" in "unlikely".
+        alternation = "|".join(
+            re.escape(word) for word in sorted(self.filler_words, key=len, reverse=True)
+        )
+        self._pattern = (
+            re.compile(r"\b(?:" + alternation + r")\b") if self.filler_words else None
+        )
+
+        # When every filler word is a single token (the common case), matching
+        # whole words is the same as tokenizing and checking set membership.
+        self._filler_set = frozenset(self.filler_words)
+        self._single_tokens = all(
+            _TOKEN_RE.fullmatch(word) for word in self.filler_words
+        )
+
+        # Otherwise prefer an Aho-Corasick automaton when pyahocorasick is installed
+        self._automaton = None
+        if ahocorasick is not None and self.filler_words and not self._single_tokens:
+            automaton = ahocorasick.Automaton()
+            for word in self.filler_words:
+                automaton.add_word(word, word)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+        # Chats repeat short phrases a lot, so memoize results per message text
+        self._detect_cached = lru_cache(maxsize=self.CACHE_SIZE)(self._detect)
+
     def detect_filler_words(self, text: str) -> list[str]:
         """
         Detect all filler words in the given text.
@@ -29,19 +83,57 @@ class FillerWordsDetector:
         Returns:
             List of detected filler words (can contain duplicates if word appears multiple times)
         """
-        if not text or not self.filler_words:
+        if not text or self._pattern is None:
             return []
 
+        return list(self._detect_cached(text))
+
+    def _detect(self, text: str) -> tuple[str, ...]:
+        """
+        Detect filler words without caching.
+
+        Args:
+            text: The text to analyze
+
+        Returns:
+            Tuple of detected filler words, so it can be safely shared by the cache
+        """
         text_lower = text.lower()
-        detected = []
+        if self._single_tokens:
+            filler_set = self._filler_set
+            return tuple(
+                token for token in _TOKEN_RE.findall(text_lower) if token in filler_set
+            )
+        if self._automaton is not None:
+            return tuple(self._detect_with_automaton(text_lower))
+        return tuple(self._pattern.findall(text_lower))
+
+    def _detect_with_automaton(self, text_lower: str) -> list[str]:
+        """
+        Detect filler words using the Aho-Corasick automaton.
 
-        for filler_word in self.filler_words:
-            # Use word boundaries to match whole words only
-            # This prevents matching "like" in "unlikely"
-            pattern = r"\b" + re.escape(filler_word) + r"\b"
-            matches = re.findall(pattern, text_lower)
-            detected.extend(matches)
+        Mirrors the regex semantics: matches must sit on word boundaries and,
+        scanning left to right, the longest match wins without overlapping.
 
+        Args:
+            text_lower: The lowercased text to analyze
+
+        Returns:
+            List of detected filler words in order of appearance
+        """
+        candidates = []
+        for end, word in self._automaton.iter(text_lower):
+            start = end - len(word) + 1
+            if _is_boundary(text_lower, start) and _is_boundary(text_lower, end + 1):
+                candidates.append((start, -len(word), word))
+        candidates.sort()
+
+        detected = []
+        position = 0
+        for start, negative_length, word in candidates:
+            if start >= position:
+                detected.append(word)
+                position = start - negative_length
         return detected
 
     def count_filler_words(self, text: str) -> int:
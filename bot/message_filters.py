@@ -0,0 +1,54 @@
+"""
+Message filters for the Telegram Filler Words Bot.
+
+Checking these in the handler's filter lets python-telegram-bot skip messages
+without scheduling the handler at all.
+"""
+
+from typing import Collection
+
+from telegram import Message
+from telegram.ext import filters
+
+from bot.chat_state import ChatStateManager
+
+
+class ActiveChatFilter(filters.MessageFilter):
+    """Passes messages from chats the bot is active in."""
+
+    __slots__ = ("_state_manager",)
+
+    def __init__(self, state_manager: ChatStateManager):
+        """
+        Initialize the filter.
+
+        Args:
+            state_manager: Manager to look up whether a chat is active
+        """
+        super().__init__(name="ActiveChatFilter")
+        self._state_manager = state_manager
+
+    def filter(self, message: Message) -> bool:
+        """Check if the bot is active in the message's chat."""
+        return self._state_manager.is_active(message.chat_id)
+
+
+class AllowedUserFilter(filters.MessageFilter):
+    """Passes messages from users whose handle is in a set of normalized handles."""
+
+    __slots__ = ("_handles",)
+
+    def __init__(self, handles: Collection[str]):
+        """
+        Initialize the filter.
+
+        Args:
+            handles: Allowed usernames, lowercase and without @
+        """
+        super().__init__(name="AllowedUserFilter")
+        self._handles = handles
+
+    def filter(self, message: Message) -> bool:
+        """Check if the message's sender is allowed."""
+        user = message.from_user
+        return bool(user and user.username) and user.username.lower() in self._handles
@@ -2,107 +2,137 @@
 Messages for the Filler Words Detector Bot.
 """
 
-from typing import Optional
-
-
-class Messages:
-    """Container for all bot messages."""
-
-    # Command responses
-    START_MESSAGE = (
-        "👋 Hello! I'm a Filler Words Detector Bot!\n\n"
-        "I track filler words in your messages and provide statistics.\n\n"
-        "*Commands:*\n"
-        "• /start - Start tracking filler words (admin only)\n"
-        "• /stop - Stop tracking filler words (admin only)\n"
-        "• /stats - View your usage statistics\n"
-        "• /reset - Reset your personal statistics\n"
-        "• /group_reset - Reset statistics for entire group (admin only)\n\n"
-        "*How it works:*\n"
-        "I'll monitor all messages and notify you when filler words are detected. "
-        "You can view stats for today, this month, or all time!"
-    )
+from itertools import islice
+from typing import Final, Optional
 
-    STOP_MESSAGE = "🛑 Filler words tracking stopped. Use /start to resume tracking."
+from telegram import MessageEntity
 
-    STATS_HEADER = "📊 *Filler Words Statistics*\n\n"
 
-    STATS_PERIOD_DAILY = "📅 *Today's Stats:*\n"
-    STATS_PERIOD_MONTHLY = "📆 *Last 30 Days:*\n"
-    STATS_PERIOD_ALL_TIME = "🕐 *All-Time Stats:*\n"
+def parse_bold_markdown(text: str) -> tuple[str, tuple[MessageEntity, ...]]:
+    """
+    Convert Markdown bold markup (*text*) into plain text and bold entities.
 
-    NO_STATS_MESSAGE = "No filler words detected yet. Keep chatting!"
+    Sending the result with entities spares Telegram from parsing Markdown on
+    every request. Entity offsets are measured in UTF-16 code units, as the
+    Bot API expects.
 
-    FILLER_WORD_DETECTED = "🔔 Filler word detected: *{words}*"
+    Args:
+        text: Text whose only markup is pairs of asterisks
 
-    BOT_NOT_ACTIVE = "Bot is not tracking in this chat. Use /start to activate."
+    Returns:
+        Tuple of the plain text and its bold entities
+    """
+    parts = text.split("*")
+    if len(parts) % 2 == 0:
+        raise ValueError("Unbalanced '*' in Markdown text")
 
-    UNAUTHORIZED_USER = "Sorry, you are not authorized to use this bot."
+    entities = []
+    offset = 0
+    for index, part in enumerate(parts):
+        length = len(part.encode("utf-16-le")) // 2
+        if index % 2 == 1 and length:
+            entities.append(MessageEntity(MessageEntity.BOLD, offset, length))
+        offset += length
+    return "".join(parts), tuple(entities)
 
-    UNAUTHORIZED_ADMIN = "Sorry, only administrators can manage this bot."
 
-    RESET_SUCCESS = "✅ Your statistics have been reset successfully!"
+# Command responses
+START_MESSAGE: Final = (
+    "👋 Hello! I'm a Filler Words Detector Bot!\n\n"
+    "I track filler words in your messages and provide statistics.\n\n"
+    "*Commands:*\n"
+    "• /start - Start tracking filler words (admin only)\n"
+    "• /stop - Stop tracking filler words (admin only)\n"
+    "• /stats - View your usage statistics\n"
+    "• /reset - Reset your personal statistics\n"
+    "• /group_reset - Reset statistics for entire group (admin only)\n\n"
+    "*How it works:*\n"
+    "I'll monitor all messages and notify you when filler words are detected. "
+    "You can view stats for today, this month, or all time!"
+)
 
-    RESET_ERROR = "❌ Failed to reset your statistics. Please try again later."
+# START_MESSAGE pre-parsed into plain text and (immutable) entities
+_START_MESSAGE_PARSED = parse_bold_markdown(START_MESSAGE)
+START_MESSAGE_TEXT: Final[str] = _START_MESSAGE_PARSED[0]
+START_MESSAGE_ENTITIES: Final[tuple[MessageEntity, ...]] = tuple(
+    _START_MESSAGE_PARSED[1]
+)
 
-    GROUP_RESET_SUCCESS = (
-        "✅ All statistics for this group have been reset successfully!"
-    )
+STOP_MESSAGE: Final = "🛑 Filler words tracking stopped. Use /start to resume tracking."
+
+STATS_HEADER: Final = "📊 *Filler Words Statistics*\n\n"
+
+STATS_PERIOD_DAILY: Final = "📅 *Today's Stats:*\n"
+STATS_PERIOD_MONTHLY: Final = "📆 *Last 30 Days:*\n"
+STATS_PERIOD_ALL_TIME: Final = "🕐 *All-Time Stats:*\n"
+
+NO_STATS_MESSAGE: Final = "No filler words detected yet. Keep chatting!"
+
+# Wrapped around the already bolded word list, e.g. "*um*, *like*"
+FILLER_WORD_DETECTED_PREFIX: Final = "🔔 Filler word detected: "
+FILLER_WORD_DETECTED_SUFFIX: Final = ""
+FILLER_WORD_DETECTED: Final = (
+    FILLER_WORD_DETECTED_PREFIX + "{words}" + FILLER_WORD_DETECTED_SUFFIX
+)
+
+BOT_NOT_ACTIVE: Final = "Bot is not tracking in this chat. Use /start to activate."
+
+UNAUTHORIZED_USER: Final = "Sorry, you are not authorized to use this bot."
 
-    GROUP_RESET_ERROR = "❌ Failed to reset group statistics. Please try again later."
+UNAUTHORIZED_ADMIN: Final = "Sorry, only administrators can manage this bot."
 
-    # Settings
-    TOP_N_WORDS: Optional[int] = None
+RESET_SUCCESS: Final = "✅ Your statistics have been reset successfully!"
 
-    def format_stats(self, daily: dict, monthly: dict, all_time: dict) -> str:
-        """
-        Format statistics into a readable message.
+RESET_ERROR: Final = "❌ Failed to reset your statistics. Please try again later."
 
-        Args:
-            daily: Daily statistics dict
-            monthly: Monthly statistics dict
-            all_time: All-time statistics dict
+GROUP_RESET_SUCCESS: Final = (
+    "✅ All statistics for this group have been reset successfully!"
+)
 
-        Returns:
-            Formatted statistics message
-        """
-        message = self.STATS_HEADER
+GROUP_RESET_ERROR: Final = (
+    "❌ Failed to reset group statistics. Please try again later."
+)
 
+STATE_SAVE_ERROR: Final = "❌ Failed to save the bot state. Please try again later."
+
+# Settings
+TOP_N_WORDS: Optional[int] = None
+
+
+def format_stats(stats: dict) -> str:
+    """
+    Format statistics into a readable message.
+
+    Args:
+        stats: Statistics as returned by FillerWordsDatabase.get_all_stats
+
+    Returns:
+        Formatted statistics message
+    """
+    totals = stats["totals"]
+    parts = [
+        STATS_HEADER,
         # Show totals for each period
-        message += f"📅 Today: *{daily['total']}* | "
-        message += f"📆 Last 30 Days: *{monthly['total']}* | "
-        message += f"🕐 All-Time: *{all_time['total']}*\n\n"
-
-        # Collect all unique words across all periods
-        all_words = set()
-        daily_dict = dict(daily.get("breakdown", []))
-        monthly_dict = dict(monthly.get("breakdown", []))
-        all_time_dict = dict(all_time.get("breakdown", []))
-
-        all_words.update(daily_dict.keys())
-        all_words.update(monthly_dict.keys())
-        all_words.update(all_time_dict.keys())
-
-        if not all_words:
-            message += self.NO_STATS_MESSAGE
-            return message
-
-        # Sort words by all-time count (descending)
-        sorted_words = sorted(
-            all_words, key=lambda w: all_time_dict.get(w, 0), reverse=True
-        )
-
-        # Apply TOP_N_WORDS limit if set
-        if self.TOP_N_WORDS is not None:
-            sorted_words = sorted_words[: self.TOP_N_WORDS]
-
-        # Format each word with its counts across periods
-        message += "*Breakdown by word (word - daily - monthly - all-time):*\n"
-        for word in sorted_words:
-            daily_count = daily_dict.get(word, 0)
-            monthly_count = monthly_dict.get(word, 0)
-            all_time_count = all_time_dict.get(word, 0)
-
-            message += f"• {word}: {daily_count} / {monthly_count} / {all_time_count}\n"
-
-        return message
+        f"📅 Today: *{totals['daily']}* | "
+        f"📆 Last 30 Days: *{totals['monthly']}* | "
+        f"🕐 All-Time: *{totals['all_time']}*\n\n",
+    ]
+
+    # Words are already ordered by all-time count (descending)
+    breakdown = stats["breakdown"]
+    if not breakdown:
+        parts.append(NO_STATS_MESSAGE)
+        return "".join(parts)
+
+    # Apply TOP_N_WORDS limit if set, without copying the breakdown
+    if TOP_N_WORDS is not None:
+        breakdown = islice(breakdown, TOP_N_WORDS)
+
+    # Format each word with its counts across periods
+    parts.append("*Breakdown by word (word - daily - monthly - all-time):*\n")
+    parts.extend(
+        f"• {word}: {daily_count} / {monthly_count} / {all_time_count}\n"
+        for word, daily_count, monthly_count, all_time_count in breakdown
+    )
+
+    return "".join(parts)
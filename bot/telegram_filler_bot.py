@@ -2,7 +2,11 @@
 Telegram bot for detecting and tracking filler words in messages.
 """
 
+import asyncio
+import functools
 import logging
+from collections import Counter
+from typing import Awaitable, Callable, Collection
 from telegram import Update
 from telegram.ext import (
     ApplicationBuilder,
@@ -15,17 +19,91 @@ from telegram.constants import ParseMode
 
 from bot.database import FillerWordsDatabase
 from bot.filler_detector import FillerWordsDetector
-from bot.messages import Messages
-from bot.chat_state import ChatStateManager
+from bot import messages as M
+from bot.chat_state import SQLiteChatStateManager
+from bot.message_filters import ActiveChatFilter, AllowedUserFilter
+
+# Signature of the bot's update handlers
+Handler = Callable[
+    ["TelegramFillerBot", Update, ContextTypes.DEFAULT_TYPE], Awaitable[None]
+]
+
+
+def _has_sender(update: Update) -> bool:
+    """Check if the update carries a message with a chat and a sender."""
+    message = update.message
+    return bool(message and message.from_user and update.effective_chat)
+
+
+def requires_active(handler: Handler) -> Handler:
+    """Run a handler only if the bot is active in the chat."""
+
+    @functools.wraps(handler)
+    async def wrapper(self, update, context):
+        if not _has_sender(update):
+            return
+        chat_id = update.effective_chat.id
+        if not self.state_manager.is_active(chat_id):
+            await self._safe_reply(update, M.BOT_NOT_ACTIVE)
+            return
+        await handler(self, update, context)
+
+    return wrapper
+
+
+def requires_admin(handler: Handler) -> Handler:
+    """Run a handler only for admins (if admins are configured, empty/None = allow all)."""
+    command = handler.__name__.removesuffix("_command")
+
+    @functools.wraps(handler)
+    async def wrapper(self, update, context):
+        if not _has_sender(update):
+            return
+        if self._admin_set and not self._is_admin(update):
+            await self._safe_reply(update, M.UNAUTHORIZED_ADMIN)
+            user = update.message.from_user
+            self.logger.warning(
+                "Unauthorized %s attempt by user %s (ID: %s) in chat %s",
+                command,
+                user.username or "Unknown",
+                user.id,
+                update.effective_chat.id,
+            )
+            return
+        await handler(self, update, context)
+
+    return wrapper
+
+
+def requires_allowed(handler: Handler) -> Handler:
+    """Run a handler only for allowed users (if allowed users are configured)."""
+
+    @functools.wraps(handler)
+    async def wrapper(self, update, context):
+        if not _has_sender(update):
+            return
+        if self._allowed_set and not self._is_allowed(update):
+            await self._safe_reply(update, M.UNAUTHORIZED_USER)
+            return
+        await handler(self, update, context)
+
+    return wrapper
 
 
 class TelegramFillerBot:
     """Telegram bot that detects and tracks filler words."""
 
+    # Seconds Telegram holds a getUpdates request open waiting for updates, and
+    # how much longer to wait for its response on top of that
+    POLL_TIMEOUT = 20
+    POLL_READ_TIMEOUT = 5
+    # Maximum number of updates handled at once
+    CONCURRENT_UPDATES = 32
+
     def __init__(
         self,
         telegram_token: str,
-        filler_words: list[str],
+        filler_words: Collection[str],
         db_path: str = "filler_words.db",
         allowed_handles: list[str] | None = None,
         admin_handles: list[str] | None = None,
@@ -36,7 +114,7 @@ class TelegramFillerBot:
 
         Args:
             telegram_token: Telegram bot API token
-            filler_words: List of filler words to detect
+            filler_words: Filler words to detect
             db_path: Path to SQLite database file
             allowed_handles: Optional list of allowed usernames (without @)
             admin_handles: Optional list of admin usernames (without @)
@@ -46,17 +124,32 @@ class TelegramFillerBot:
         self.filler_words = filler_words
         self.allowed_handles = allowed_handles
         self.admin_handles = admin_handles
+        # Normalized (no "@", lowercase) handles for O(1) authorization checks
+        self._allowed_set = frozenset(
+            h.lstrip("@").lower() for h in (allowed_handles or ())
+        )
+        self._admin_set = frozenset(
+            h.lstrip("@").lower() for h in (admin_handles or ())
+        )
         self.logger = logger or logging.getLogger(self.__class__.__name__)
 
         # Initialize components
         self.database = FillerWordsDatabase(db_path)
         self.detector = FillerWordsDetector(filler_words)
-        self.state_manager = ChatStateManager()
-        self.messages = Messages()
+        self.database.register_words(self.detector.filler_words)
+        self.state_manager = SQLiteChatStateManager(self.database)
 
     def run(self) -> None:
         """Run the bot."""
-        application = ApplicationBuilder().token(self.telegram_token).build()
+        # Handlers run concurrently (but bounded) so a slow update does not hold
+        # up the next one
+        application = (
+            ApplicationBuilder()
+            .token(self.telegram_token)
+            .get_updates_connect_timeout(10)
+            .concurrent_updates(self.CONCURRENT_UPDATES)
+            .build()
+        )
 
         # Add command handlers
         application.add_handler(CommandHandler("start", self.start_command))
@@ -65,329 +158,223 @@ class TelegramFillerBot:
         application.add_handler(CommandHandler("reset", self.reset_command))
         application.add_handler(CommandHandler("group_reset", self.group_reset_command))
 
-        # Add message handler for filler word detection
-        application.add_handler(
-            MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_message)
+        # Add message handler for filler word detection. Inactive chats and
+        # users who aren't allowed are filtered out before the handler runs.
+        message_filter = (
+            filters.TEXT
+            & ~filters.COMMAND
+            & (filters.ChatType.GROUPS | filters.ChatType.PRIVATE)
+            & ActiveChatFilter(self.state_manager)
         )
+        if self._allowed_set:
+            message_filter &= AllowedUserFilter(self._allowed_set)
+        application.add_handler(MessageHandler(message_filter, self.handle_message))
 
         self.logger.info("Filler Words Bot started")
-        application.run_polling()
+        try:
+            # Only message updates are handled, so don't fetch any others.
+            # getUpdates waits POLL_TIMEOUT + read_timeout for each response.
+            application.run_polling(
+                timeout=self.POLL_TIMEOUT,
+                read_timeout=self.POLL_READ_TIMEOUT,
+                poll_interval=0.0,
+                allowed_updates=[Update.MESSAGE],
+                drop_pending_updates=True,
+            )
+        finally:
+            self.database.close()
+
+    async def _safe_reply(self, update: Update, text: str, **kwargs) -> bool:
+        """
+        Reply to the update's message, logging instead of raising on failure.
 
+        Args:
+            update: The incoming update
+            text: The reply text
+            **kwargs: Extra arguments for reply_text
+
+        Returns:
+            True if the reply was sent, False otherwise
+        """
+        try:
+            await update.message.reply_text(text, **kwargs)
+            return True
+        except Exception as e:
+            self.logger.error(
+                "Error sending reply in chat %s: %s", update.effective_chat.id, e
+            )
+            return False
+
+    @requires_admin
     async def start_command(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
     ) -> None:
         """Handle the /start command."""
-        if not update.message or not update.effective_chat:
-            return
-
-        # Check if user is an admin (if admin list is configured, empty/None = allow all)
-        if (
-            self.admin_handles
-            and len(self.admin_handles) > 0
-            and not self._is_admin(update)
-        ):
-            try:
-                await update.message.reply_text(self.messages.UNAUTHORIZED_ADMIN)
-            except Exception as e:
-                self.logger.error(f"Error sending unauthorized message: {e}")
-            username = update.message.from_user.username or "Unknown"
-            self.logger.warning(
-                f"Unauthorized start attempt by user {username} (ID: {update.message.from_user.id})"
-            )
-            return
+        chat_id = update.effective_chat.id
 
         # Activate bot for this chat
-        chat_id = update.effective_chat.id
-        self.state_manager.set_active(chat_id, True)
+        if not await asyncio.to_thread(self.state_manager.set_active, chat_id, True):
+            await self._safe_reply(update, M.STATE_SAVE_ERROR)
+            return
 
-        try:
-            await update.message.reply_text(
-                self.messages.START_MESSAGE,
-                parse_mode=ParseMode.MARKDOWN,
-            )
-            self.logger.info(f"Bot activated in chat {chat_id}")
-        except Exception as e:
-            self.logger.error(f"Error sending start message: {e}")
+        if await self._safe_reply(
+            update, M.START_MESSAGE_TEXT, entities=M.START_MESSAGE_ENTITIES
+        ):
+            self.logger.info("Bot activated in chat %s", chat_id)
 
+    @requires_admin
     async def stop_command(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
     ) -> None:
         """Handle the /stop command."""
-        if not update.message or not update.effective_chat:
-            return
-
-        # Check if user is an admin (if admin list is configured, empty/None = allow all)
-        if (
-            self.admin_handles
-            and len(self.admin_handles) > 0
-            and not self._is_admin(update)
-        ):
-            try:
-                await update.message.reply_text(self.messages.UNAUTHORIZED_ADMIN)
-            except Exception as e:
-                self.logger.error(f"Error sending unauthorized message: {e}")
-            username = update.message.from_user.username or "Unknown"
-            self.logger.warning(
-                f"Unauthorized stop attempt by user {username} (ID: {update.message.from_user.id})"
-            )
-            return
+        chat_id = update.effective_chat.id
 
         # Deactivate bot for this chat
-        chat_id = update.effective_chat.id
-        self.state_manager.set_active(chat_id, False)
+        if not await asyncio.to_thread(self.state_manager.set_active, chat_id, False):
+            await self._safe_reply(update, M.STATE_SAVE_ERROR)
+            return
 
-        try:
-            await update.message.reply_text(self.messages.STOP_MESSAGE)
-            self.logger.info(f"Bot deactivated in chat {chat_id}")
-        except Exception as e:
-            self.logger.error(f"Error sending stop message: {e}")
+        if await self._safe_reply(update, M.STOP_MESSAGE):
+            self.logger.info("Bot deactivated in chat %s", chat_id)
 
+    @requires_active
+    @requires_allowed
     async def stats_command(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
     ) -> None:
         """Handle the /stats command - show statistics for the user."""
-        if (
-            not update.message
-            or not update.effective_chat
-            or not update.message.from_user
-        ):
-            return
-
         chat_id = update.effective_chat.id
         user_id = update.message.from_user.id
 
-        # Check if bot is active in this chat
-        if not self.state_manager.is_active(chat_id):
-            try:
-                await update.message.reply_text(self.messages.BOT_NOT_ACTIVE)
-            except Exception as e:
-                self.logger.error(f"Error sending bot not active message: {e}")
-            return
-
-        # Check if user is allowed to use the bot
-        if (
-            self.allowed_handles
-            and len(self.allowed_handles) > 0
-            and not self._is_allowed(update)
-        ):
-            try:
-                await update.message.reply_text(self.messages.UNAUTHORIZED_USER)
-            except Exception as e:
-                self.logger.error(f"Error sending unauthorized user message: {e}")
-            return
-
-        # Get statistics from database
-        daily_stats = self.database.get_stats_daily(user_id, chat_id)
-        monthly_stats = self.database.get_stats_monthly(user_id, chat_id)
-        all_time_stats = self.database.get_stats_all_time(user_id, chat_id)
+        # Get statistics from database (off the event loop, SQLite blocks)
+        stats = await asyncio.to_thread(self.database.get_all_stats, user_id, chat_id)
 
         # Format and send statistics
-        stats_message = self.messages.format_stats(
-            daily_stats, monthly_stats, all_time_stats
-        )
+        stats_message = M.format_stats(stats)
 
-        try:
-            await update.message.reply_text(
-                stats_message,
-                parse_mode=ParseMode.MARKDOWN,
-            )
-            self.logger.info(f"Stats requested by user {user_id} in chat {chat_id}")
-        except Exception as e:
-            self.logger.error(f"Error sending stats message: {e}")
+        if await self._safe_reply(update, stats_message, parse_mode=ParseMode.MARKDOWN):
+            self.logger.info("Stats requested by user %s in chat %s", user_id, chat_id)
 
+    @requires_active
+    @requires_allowed
     async def reset_command(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
     ) -> None:
         """Handle the /reset command - reset statistics for the requesting user."""
-        if (
-            not update.message
-            or not update.effective_chat
-            or not update.message.from_user
-        ):
-            return
-
         chat_id = update.effective_chat.id
-        user_id = update.message.from_user.id
-        username = update.message.from_user.username or "Unknown"
-
-        # Check if bot is active in this chat
-        if not self.state_manager.is_active(chat_id):
-            try:
-                await update.message.reply_text(self.messages.BOT_NOT_ACTIVE)
-            except Exception as e:
-                self.logger.error(f"Error sending bot not active message: {e}")
-            return
-
-        # Check if user is allowed to use the bot
-        if (
-            self.allowed_handles
-            and len(self.allowed_handles) > 0
-            and not self._is_allowed(update)
-        ):
-            try:
-                await update.message.reply_text(self.messages.UNAUTHORIZED_USER)
-            except Exception as e:
-                self.logger.error(f"Error sending unauthorized user message: {e}")
-            return
+        user = update.message.from_user
+        user_id = user.id
+        username = user.username or "Unknown"
 
         # Reset user's statistics
-        success = self.database.reset_user_stats(user_id, chat_id)
+        success = await asyncio.to_thread(
+            self.database.reset_user_stats, user_id, chat_id
+        )
 
-        if success:
-            try:
-                await update.message.reply_text(self.messages.RESET_SUCCESS)
-                self.logger.info(
-                    f"Stats reset by user {username} (ID: {user_id}) in chat {chat_id}"
-                )
-            except Exception as e:
-                self.logger.error(f"Error sending reset success message: {e}")
-        else:
-            try:
-                await update.message.reply_text(self.messages.RESET_ERROR)
-            except Exception as e:
-                self.logger.error(f"Error sending reset error message: {e}")
+        if not success:
+            await self._safe_reply(update, M.RESET_ERROR)
+        elif await self._safe_reply(update, M.RESET_SUCCESS):
+            self.logger.info(
+                "Stats reset by user %s (ID: %s) in chat %s",
+                username,
+                user_id,
+                chat_id,
+            )
 
+    @requires_active
+    @requires_admin
     async def group_reset_command(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
     ) -> None:
         """Handle the /group_reset command - reset statistics for entire group (admin only)."""
-        if not update.message or not update.effective_chat:
-            return
-
         chat_id = update.effective_chat.id
-
-        # Check if bot is active in this chat
-        if not self.state_manager.is_active(chat_id):
-            try:
-                await update.message.reply_text(self.messages.BOT_NOT_ACTIVE)
-            except Exception as e:
-                self.logger.error(f"Error sending bot not active message: {e}")
-            return
-
-        # Check if user is an admin (required for group reset)
-        if (
-            self.admin_handles
-            and len(self.admin_handles) > 0
-            and not self._is_admin(update)
-        ):
-            try:
-                await update.message.reply_text(self.messages.UNAUTHORIZED_ADMIN)
-            except Exception as e:
-                self.logger.error(f"Error sending unauthorized admin message: {e}")
-            username = update.message.from_user.username or "Unknown"
-            self.logger.warning(
-                f"Unauthorized group_reset attempt by user {username} "
-                f"(ID: {update.message.from_user.id}) in chat {chat_id}"
-            )
-            return
+        user = update.message.from_user
+        user_id = user.id
+        username = user.username or "Unknown"
 
         # Reset all statistics for this chat
-        success = self.database.reset_chat_stats(chat_id)
-
-        if success:
-            try:
-                await update.message.reply_text(self.messages.GROUP_RESET_SUCCESS)
-                username = update.message.from_user.username or "Unknown"
-                self.logger.info(
-                    f"Group stats reset by admin {username} (ID: {update.message.from_user.id}) "
-                    f"in chat {chat_id}"
-                )
-            except Exception as e:
-                self.logger.error(f"Error sending group reset success message: {e}")
-        else:
-            try:
-                await update.message.reply_text(self.messages.GROUP_RESET_ERROR)
-            except Exception as e:
-                self.logger.error(f"Error sending group reset error message: {e}")
+        success = await asyncio.to_thread(self.database.reset_chat_stats, chat_id)
+
+        if not success:
+            await self._safe_reply(update, M.GROUP_RESET_ERROR)
+        elif await self._safe_reply(update, M.GROUP_RESET_SUCCESS):
+            self.logger.info(
+                "Group stats reset by admin %s (ID: %s) in chat %s",
+                username,
+                user_id,
+                chat_id,
+            )
 
     async def handle_message(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
     ) -> None:
-        """Handle incoming messages and detect filler words."""
-        if not update.message or not update.message.text or not update.effective_chat:
-            return
-
-        if not update.message.from_user:
-            return
-
-        chat_id = update.effective_chat.id
-        user_id = update.message.from_user.id
-        username = update.message.from_user.username or "Unknown"
+        """
+        Handle incoming messages and detect filler words.
 
-        # Check if bot is active in this chat
-        if not self.state_manager.is_active(chat_id):
-            self.logger.debug(f"Bot is not active in chat {chat_id}, ignoring message")
+        Only messages from active chats and allowed users reach this handler,
+        see the filters registered in run().
+        """
+        message = update.message
+        chat = update.effective_chat
+        if not message or not chat:
             return
 
-        # Check if user is allowed to use the bot
-        if (
-            self.allowed_handles
-            and len(self.allowed_handles) > 0
-            and not self._is_allowed(update)
-        ):
-            self.logger.debug(f"Message from unauthorized user {username} ignored")
+        text = message.text
+        user = message.from_user
+        if not text or not user:
             return
 
-        text = update.message.text
+        chat_id = chat.id
+        user_id = user.id
+        username = user.username or "Unknown"
 
         # Detect filler words in the message
         detected_words = self.detector.detect_filler_words(text)
 
         if detected_words:
-            # Record each filler word in the database
-            for word in detected_words:
-                self.database.record_filler_word(user_id, chat_id, word)
+            # Record all filler words in the database at once
+            await asyncio.to_thread(
+                self.database.record_filler_words,
+                user_id,
+                chat_id,
+                Counter(detected_words),
+            )
 
             # Notify the user about detected filler words
-            unique_words = list(set(detected_words))
-            words_text = ", ".join(f"*{word}*" for word in unique_words)
-
-            notification = self.messages.FILLER_WORD_DETECTED.format(words=words_text)
+            # Deduplicate, keeping the order words appeared in the message
+            unique_words = dict.fromkeys(detected_words)
+            words_text = f"*{'*, *'.join(unique_words)}*"
+
+            notification = (
+                M.FILLER_WORD_DETECTED_PREFIX
+                + words_text
+                + M.FILLER_WORD_DETECTED_SUFFIX
+            )
 
-            try:
-                await update.message.reply_text(
-                    notification,
-                    parse_mode=ParseMode.MARKDOWN,
-                )
+            if await self._safe_reply(
+                update, notification, parse_mode=ParseMode.MARKDOWN
+            ):
                 self.logger.info(
-                    f"Filler words detected from user {username} (ID: {user_id}) "
-                    f"in chat {chat_id}: {detected_words}"
+                    "Filler words detected from user %s (ID: %s) in chat %s: %s",
+                    username,
+                    user_id,
+                    chat_id,
+                    detected_words,
                 )
-            except Exception as e:
-                self.logger.error(f"Error sending filler word notification: {e}")
 
     def _is_admin(self, update: Update) -> bool:
         """Check if the user is an admin."""
-        if not update.message or not update.message.from_user:
-            return False
-
-        username = update.message.from_user.username
-        if not username:
-            return False
-
-        # Handle both with and without @ prefix
-        handle_with_at = "@" + username
-
-        return (
-            (username in self.admin_handles or handle_with_at in self.admin_handles)
-            if self.admin_handles
-            else False
-        )
+        return self._handle_in(update, self._admin_set)
 
     def _is_allowed(self, update: Update) -> bool:
         """Check if the user is allowed to use the bot."""
-        if not update.message or not update.message.from_user:
-            return False
-
-        username = update.message.from_user.username
-        if not username:
+        return self._handle_in(update, self._allowed_set)
+
+    @staticmethod
+    def _handle_in(update: Update, handles: frozenset[str]) -> bool:
+        """Check if the user's handle is in a set of normalized handles."""
+        message = update.message
+        user = message.from_user if message else None
+        if not user or not user.username:
             return False
-
-        # Handle both with and without @ prefix
-        handle_with_at = "@" + username
-
-        return (
-            (username in self.allowed_handles or handle_with_at in self.allowed_handles)
-            if self.allowed_handles
-            else False
-        )
+        return user.username.lower() in handles
@@ -21,9 +21,9 @@ def main():
 
     # Get filler words from environment variable
     filler_words_str = config("FILLER_WORDS", default="")
-    filler_words = [
-        word.strip() for word in filler_words_str.split(",") if word.strip()
-    ]
+    filler_words = frozenset(
+        word.strip().lower() for word in filler_words_str.split(",") if word.strip()
+    )
 
     if not filler_words:
         logging.error(
@@ -57,7 +57,9 @@ def main():
         logger=logging.getLogger("FillerWordsBot"),
     )
 
-    logging.info(f"Bot configured with filler words: {', '.join(filler_words)}")
+    logging.info(
+        "Bot configured with filler words: %s", ", ".join(sorted(filler_words))
+    )
     tg_bot.run()
 
 
@@ -1,6 +1,9 @@
 """Tests for ChatState and ChatStateManager."""
 
-from bot.chat_state import ChatState, ChatStateManager
+import tempfile
+import os
+from bot.chat_state import ChatState, ChatStateManager, SQLiteChatStateManager
+from bot.database import FillerWordsDatabase
 
 
 def test_chat_state_toggle():
@@ -21,3 +24,70 @@ def test_chat_state_manager():
 
     assert manager.is_active(123) is True
     assert manager.is_active(456) is False
+
+
+def test_get_state_writes_through_manager():
+    """Test that changing a chat's state through get_state updates the manager."""
+    manager = ChatStateManager()
+
+    state = manager.get_state(123)
+    state.set_active(True)
+    assert manager.is_active(123) is True
+    assert state.toggle_active() is False
+    assert manager.is_active(123) is False
+    state.is_active = True
+    assert manager.is_active(123) is True
+
+    manager.set_active(123, False)
+    assert state.is_active is False
+
+
+def test_is_active_does_not_create_state():
+    """Test that checking or deactivating a chat doesn't store state for it."""
+    manager = ChatStateManager()
+
+    assert manager.is_active(789) is False
+    manager.set_active(789, True)
+    manager.set_active(789, False)
+    assert manager._active == set()
+    assert manager.get_state(789).is_active is False
+
+
+def test_chat_state_manager_persistence():
+    """Test that active chats are restored from the database."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".db") as tmp_file:
+        db_path = tmp_file.name
+
+    try:
+        db = FillerWordsDatabase(db_path)
+        manager = SQLiteChatStateManager(db)
+        manager.set_active(123, True)
+        manager.set_active(456, True)
+        manager.get_state(456).set_active(False)
+        db.close()
+
+        db = FillerWordsDatabase(db_path)
+        restored = SQLiteChatStateManager(db)
+
+        assert restored.is_active(123) is True
+        assert restored.is_active(456) is False
+        db.close()
+    finally:
+        os.unlink(db_path)
+
+
+def test_chat_state_unchanged_when_save_fails(monkeypatch):
+    """Test that a chat state change is dropped if it can't be persisted."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".db") as tmp_file:
+        db_path = tmp_file.name
+
+    try:
+        db = FillerWordsDatabase(db_path)
+        manager = SQLiteChatStateManager(db)
+        monkeypatch.setattr(db, "save_chat_state", lambda chat_id, active: False)
+
+        assert manager.set_active(123, True) is False
+        assert manager.is_active(123) is False
+        db.close()
+    finally:
+        os.unlink(db_path)
@@ -1,7 +1,9 @@
 """Tests for FillerWordsDatabase."""
 
+import sqlite3
 import tempfile
 import os
+from datetime import datetime, timedelta
 from bot.database import FillerWordsDatabase
 
 
@@ -24,6 +26,7 @@ def test_record_and_get_stats():
         assert stats["total"] == 3
         assert len(stats["breakdown"]) == 2
         assert dict(stats["breakdown"])["like"] == 2
+        db.close()
     finally:
         os.unlink(db_path)
 
@@ -41,5 +44,305 @@ def test_reset_user_stats():
 
         stats = db.get_stats_all_time(user_id=1, chat_id=100)
         assert stats["total"] == 0
+        db.close()
+    finally:
+        os.unlink(db_path)
+
+
+def test_record_filler_words_batch():
+    """Test recording several filler words at once."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".db") as tmp_file:
+        db_path = tmp_file.name
+
+    try:
+        db = FillerWordsDatabase(db_path)
+
+        assert db.record_filler_words(user_id=1, chat_id=100, counts={"um": 2})
+        assert db.record_filler_words(user_id=1, chat_id=100, counts={})
+
+        stats = db.get_stats_all_time(user_id=1, chat_id=100)
+        assert stats["total"] == 2
+        assert stats["breakdown"] == [("um", 2)]
+        db.close()
+    finally:
+        os.unlink(db_path)
+
+
+def test_counts_backfilled_for_existing_database():
+    """Test that the all-time rollup is built from previously recorded usage."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".db") as tmp_file:
+        db_path = tmp_file.name
+
+    try:
+        db = FillerWordsDatabase(db_path)
+        db.record_filler_words(user_id=1, chat_id=100, counts={"um": 2, "like": 1})
+        db.flush()
+        with db._conn as conn:
+            conn.execute("DROP TABLE filler_word_counts")
+        db.close()
+
+        db = FillerWordsDatabase(db_path)
+        stats = db.get_stats_all_time(user_id=1, chat_id=100)
+
+        assert stats["total"] == 3
+        assert stats["breakdown"][0] == ("um", 2)
+        db.close()
+    finally:
+        os.unlink(db_path)
+
+
+def test_migrates_word_text_schema():
+    """Test that usage stored by older schemas is migrated on startup."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".db") as tmp_file:
+        db_path = tmp_file.name
+
+    try:
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                """
+                CREATE TABLE filler_words_usage (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER NOT NULL,
+                    chat_id INTEGER NOT NULL,
+                    word TEXT NOT NULL,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+                """
+            )
+            now = datetime.now().isoformat()
+            conn.executemany(
+                """
+                INSERT INTO filler_words_usage (user_id, chat_id, word, timestamp)
+                VALUES (?, ?, ?, ?)
+                """,
+                [(1, 100, "like", now), (1, 100, "um", now), (1, 100, "like", now)],
+            )
+        conn.close()
+
+        db = FillerWordsDatabase(db_path)
+        db.record_filler_word(user_id=1, chat_id=100, word="um")
+        stats = db.get_stats_all_time(user_id=1, chat_id=100)
+
+        assert stats["total"] == 4
+        assert sorted(stats["breakdown"]) == [("like", 2), ("um", 2)]
+        assert db.get_stats_daily(user_id=1, chat_id=100)["total"] == 4
+        timestamps = db._conn.execute(
+            "SELECT DISTINCT timestamp FROM filler_words_usage"
+        ).fetchall()
+        assert all(isinstance(ts, int) for (ts,) in timestamps)
+        db.close()
+    finally:
+        os.unlink(db_path)
+
+
+def test_migrates_unparseable_timestamps():
+    """Test that legacy rows with unparseable timestamps don't block startup."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".db") as tmp_file:
+        db_path = tmp_file.name
+
+    try:
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                """
+                CREATE TABLE filler_words_usage (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER NOT NULL,
+                    chat_id INTEGER NOT NULL,
+                    word TEXT NOT NULL,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+                """
+            )
+            conn.executemany(
+                """
+                INSERT INTO filler_words_usage (user_id, chat_id, word, timestamp)
+                VALUES (?, ?, ?, ?)
+                """,
+                [
+                    (1, 100, "um", datetime.now().isoformat()),
+                    (1, 100, "um", "garbage"),
+                    (1, 100, "um", None),
+                ],
+            )
+        conn.close()
+
+        db = FillerWordsDatabase(db_path)
+
+        assert db.get_stats_all_time(user_id=1, chat_id=100)["total"] == 3
+        assert db.get_stats_daily(user_id=1, chat_id=100)["total"] == 1
+        db.close()
+    finally:
+        os.unlink(db_path)
+
+
+def test_stats_cache_invalidated_on_record():
+    """Test that cached statistics are refreshed after new usage is recorded."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".db") as tmp_file:
+        db_path = tmp_file.name
+
+    try:
+        db = FillerWordsDatabase(db_path)
+
+        db.record_filler_word(user_id=1, chat_id=100, word="um")
+        assert db.get_stats_daily(user_id=1, chat_id=100)["total"] == 1
+        assert db.get_all_stats(user_id=1, chat_id=100) is db.get_all_stats(
+            user_id=1, chat_id=100
+        )
+
+        db.record_filler_word(user_id=1, chat_id=100, word="um")
+        assert db.get_stats_daily(user_id=1, chat_id=100)["total"] == 2
+        db.close()
+    finally:
+        os.unlink(db_path)
+
+
+def test_get_all_stats_periods():
+    """Test that combined statistics split counts by period."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".db") as tmp_file:
+        db_path = tmp_file.name
+
+    try:
+        db = FillerWordsDatabase(db_path)
+        now = datetime.now()
+
+        db.record_filler_words(1, 100, {"um": 1, "like": 1}, timestamp=now)
+        db.record_filler_words(1, 100, {"um": 1}, timestamp=now - timedelta(days=2))
+        db.record_filler_words(1, 100, {"um": 1}, timestamp=now - timedelta(days=60))
+
+        stats = db.get_all_stats(user_id=1, chat_id=100)
+
+        assert stats["totals"] == {"daily": 2, "monthly": 3, "all_time": 4}
+        assert stats["breakdown"] == [("um", 1, 2, 3), ("like", 1, 1, 1)]
+        db.close()
+    finally:
+        os.unlink(db_path)
+
+
+def test_get_all_stats_and_period_views():
+    """Test that the per-period statistics agree with the combined statistics."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".db") as tmp_file:
+        db_path = tmp_file.name
+
+    try:
+        db = FillerWordsDatabase(db_path)
+        now = datetime.now()
+
+        db.record_filler_words(1, 100, {"like": 2, "um": 1}, timestamp=now)
+        db.record_filler_words(1, 100, {"um": 3}, timestamp=now - timedelta(days=2))
+
+        stats = db.get_all_stats(user_id=1, chat_id=100)
+        assert stats["totals"] == {"daily": 3, "monthly": 6, "all_time": 6}
+        assert stats["breakdown"] == [("um", 1, 4, 4), ("like", 2, 2, 2)]
+
+        assert db.get_stats_daily(user_id=1, chat_id=100) == {
+            "total": 3,
+            "breakdown": [("like", 2), ("um", 1)],
+        }
+        assert db.get_stats_monthly(user_id=1, chat_id=100)["breakdown"] == [
+            ("um", 4),
+            ("like", 2),
+        ]
+        db.close()
+    finally:
+        os.unlink(db_path)
+
+
+def test_buffered_usage_written_on_close():
+    """Test that buffered usage is written when the database is closed."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".db") as tmp_file:
+        db_path = tmp_file.name
+
+    try:
+        db = FillerWordsDatabase(db_path)
+        db.record_filler_words(user_id=1, chat_id=100, counts={"um": 300})
+        db.record_filler_words(user_id=1, chat_id=100, counts={"like": 1})
+        db.close()
+
+        db = FillerWordsDatabase(db_path)
+        stats = db.get_stats_all_time(user_id=1, chat_id=100)
+
+        assert stats["breakdown"] == [("um", 300), ("like", 1)]
+        db.close()
+    finally:
+        os.unlink(db_path)
+
+
+def test_failed_flush_keeps_usage_queued(monkeypatch):
+    """Test that usage is kept when a write fails, and refused after close."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".db") as tmp_file:
+        db_path = tmp_file.name
+
+    try:
+        db = FillerWordsDatabase(db_path)
+        db.record_filler_words(user_id=1, chat_id=100, counts={"um": 2})
+
+        def fail(*args):
+            raise sqlite3.OperationalError("database is locked")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(db, "_lookup_word_ids", fail)
+            assert db.flush() is False
+
+        stats = db.get_all_stats(user_id=1, chat_id=100)
+        assert stats["breakdown"] == [("um", 2, 2, 2)]
+        db.close()
+
+        assert db.record_filler_word(user_id=1, chat_id=100, word="um") is False
+    finally:
+        os.unlink(db_path)
+
+
+def test_bad_rows_do_not_block_writes(monkeypatch):
+    """Test that rows which can never be written are dropped, not retried."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".db") as tmp_file:
+        db_path = tmp_file.name
+
+    try:
+        db = FillerWordsDatabase(db_path)
+        db.record_filler_words(user_id=1, chat_id=2, counts={None: 1})
+        db.record_filler_words(user_id=1, chat_id=2, counts={"um": 3})
+
+        assert db.flush() is False
+        assert len(db._pending) == 0
+        assert db.get_stats_all_time(user_id=1, chat_id=2)["breakdown"] == [("um", 3)]
+
+        # Transient errors are retried only up to FLUSH_RETRIES times
+        def fail(*args):
+            raise sqlite3.OperationalError("database is locked")
+
+        db.record_filler_word(user_id=1, chat_id=2, word="um")
+        with monkeypatch.context() as patch:
+            patch.setattr(db, "_lookup_word_ids", fail)
+            for _ in range(db.FLUSH_RETRIES):
+                assert db.flush() is False
+        assert len(db._pending) == 0
+        db.close()
+    finally:
+        os.unlink(db_path)
+
+
+def test_reset_discards_pending_usage(monkeypatch):
+    """Test that usage still queued when stats are reset is not written later."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".db") as tmp_file:
+        db_path = tmp_file.name
+
+    try:
+        db = FillerWordsDatabase(db_path)
+
+        def fail(*args):
+            raise sqlite3.OperationalError("database is locked")
+
+        db.record_filler_words(user_id=1, chat_id=100, counts={"um": 4})
+        db.record_filler_words(user_id=2, chat_id=100, counts={"like": 1})
+        with monkeypatch.context() as patch:
+            patch.setattr(db, "_lookup_word_ids", fail)
+            assert db.flush() is False
+
+        assert db.reset_user_stats(user_id=1, chat_id=100) is True
+        db.flush()
+
+        assert db.get_stats_all_time(user_id=1, chat_id=100)["total"] == 0
+        assert db.get_stats_all_time(user_id=2, chat_id=100)["total"] == 1
+        db.close()
     finally:
         os.unlink(db_path)
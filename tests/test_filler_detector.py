@@ -1,5 +1,7 @@
 """Tests for FillerWordsDetector."""
 
+import pytest
+
 from bot.filler_detector import FillerWordsDetector
 
 
@@ -24,3 +26,53 @@ def test_get_filler_words_breakdown():
 
     assert breakdown["basically"] == 1
     assert breakdown["literally"] == 2
+
+
+def test_detect_filler_phrases_and_boundaries():
+    """Test that phrases are matched whole and partial words are ignored."""
+    detector = FillerWordsDetector(["you know", "know", "like"])
+    text = "You know, I unlikely know what you like"
+
+    detected = detector.detect_filler_words(text)
+
+    assert sorted(detected) == ["know", "like", "you know"]
+
+
+def test_automaton_matches_regex():
+    """Test that the Aho-Corasick path agrees with the regex fallback."""
+    pytest.importorskip("ahocorasick")
+    words = ["you know", "know", "like", "um"]
+    text = "Um, you know, I unlikely know what you like_ or like... um"
+
+    from_automaton = FillerWordsDetector(words).detect_filler_words(text)
+    regex_detector = FillerWordsDetector(words)
+    regex_detector._automaton = None
+    from_regex = regex_detector.detect_filler_words(text)
+
+    assert from_automaton == from_regex
+
+
+def test_detect_filler_words_cached():
+    """Test that repeated texts are served from the cache."""
+    detector = FillerWordsDetector(["um"])
+
+    first = detector.detect_filler_words("um, ok")
+    first.append("mutated")
+    second = detector.detect_filler_words("um, ok")
+
+    assert second == ["um"]
+    assert detector._detect_cached.cache_info().hits == 1
+
+
+def test_single_token_vocabulary_matches_regex():
+    """Test that the tokenizer path agrees with the regex path."""
+    words = ["like", "um", "so"]
+    text = "Um, so I like_ it, unlikely... LIKE, so-so"
+
+    from_tokens = FillerWordsDetector(words).detect_filler_words(text)
+    regex_detector = FillerWordsDetector(words)
+    regex_detector._single_tokens = False
+    regex_detector._automaton = None
+    from_regex = regex_detector.detect_filler_words(text)
+
+    assert from_tokens == from_regex == ["um", "so", "like", "so", "so"]
@@ -0,0 +1,32 @@
+"""Tests for the message filters."""
+
+from types import SimpleNamespace
+
+from bot.chat_state import ChatStateManager
+from bot.message_filters import ActiveChatFilter, AllowedUserFilter
+
+
+def _message(chat_id: int, username: str | None) -> SimpleNamespace:
+    """Build a stand-in for a Telegram message."""
+    return SimpleNamespace(
+        chat_id=chat_id, from_user=SimpleNamespace(id=1, username=username)
+    )
+
+
+def test_active_chat_filter():
+    """Test that only messages from active chats pass."""
+    manager = ChatStateManager()
+    manager.set_active(123, True)
+    active_filter = ActiveChatFilter(manager)
+
+    assert active_filter.filter(_message(123, "user")) is True
+    assert active_filter.filter(_message(456, "user")) is False
+
+
+def test_allowed_user_filter():
+    """Test that only allowed handles pass, case-insensitively."""
+    allowed_filter = AllowedUserFilter(frozenset({"alice"}))
+
+    assert allowed_filter.filter(_message(123, "Alice")) is True
+    assert allowed_filter.filter(_message(123, "bob")) is False
+    assert allowed_filter.filter(_message(123, None)) is False
@@ -1,17 +1,17 @@
-"""Tests for Messages."""
+"""Tests for the messages module."""
 
-from bot.messages import Messages
+from bot import messages
+from bot.messages import parse_bold_markdown
 
 
 def test_format_stats():
     """Test formatting statistics message."""
-    messages = Messages()
+    stats = {
+        "totals": {"daily": 5, "monthly": 20, "all_time": 50},
+        "breakdown": [("like", 3, 12, 30), ("um", 2, 8, 20)],
+    }
 
-    daily = {"total": 5, "breakdown": [("like", 3), ("um", 2)]}
-    monthly = {"total": 20, "breakdown": [("like", 12), ("um", 8)]}
-    all_time = {"total": 50, "breakdown": [("like", 30), ("um", 20)]}
-
-    result = messages.format_stats(daily, monthly, all_time)
+    result = messages.format_stats(stats)
 
     assert "5" in result
     assert "20" in result
@@ -22,10 +22,48 @@ def test_format_stats():
 
 def test_format_stats_empty():
     """Test formatting with no statistics."""
-    messages = Messages()
-
-    empty = {"total": 0, "breakdown": []}
+    empty = {"totals": {"daily": 0, "monthly": 0, "all_time": 0}, "breakdown": []}
 
-    result = messages.format_stats(empty, empty, empty)
+    result = messages.format_stats(empty)
 
     assert messages.NO_STATS_MESSAGE in result
+
+
+def test_parse_bold_markdown():
+    """Test converting bold Markdown into plain text and entities."""
+    text, entities = parse_bold_markdown("👋 Hi *there*, see *Commands:*")
+
+    assert text == "👋 Hi there, see Commands:"
+    assert [(e.type, e.offset, e.length) for e in entities] == [
+        ("bold", 6, 5),
+        ("bold", 17, 9),
+    ]
+    assert "*" not in messages.START_MESSAGE_TEXT
+    assert isinstance(messages.START_MESSAGE_ENTITIES, tuple)
+
+
+def test_format_stats_top_n(monkeypatch):
+    """Test limiting the breakdown to the top words."""
+    monkeypatch.setattr(messages, "TOP_N_WORDS", 1)
+
+    stats = {
+        "totals": {"daily": 5, "monthly": 20, "all_time": 50},
+        "breakdown": [("like", 3, 12, 30), ("um", 2, 8, 20)],
+    }
+
+    result = messages.format_stats(stats)
+
+    assert "like" in result
+    assert "um" not in result
+
+
+def test_filler_word_detected_template():
+    """Test that the notification template wraps the bolded words once."""
+    words_text = "*um*, *like*"
+
+    assert messages.FILLER_WORD_DETECTED.format(words=words_text) == (
+        messages.FILLER_WORD_DETECTED_PREFIX
+        + words_text
+        + messages.FILLER_WORD_DETECTED_SUFFIX
+    )
+    assert "**" not in messages.FILLER_WORD_DETECTED.format(words=words_text)
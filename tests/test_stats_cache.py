@@ -0,0 +1,36 @@
+"""Tests for TTLCache."""
+
+from bot.stats_cache import TTLCache
+
+
+def test_ttl_cache_expiry_and_eviction():
+    """Test that entries expire and the least recently used are evicted."""
+    cache = TTLCache(maxsize=2, ttl=30)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+    expired = TTLCache(ttl=0)
+    expired.set("a", 1)
+    assert expired.get("a") is None
+    assert len(expired) == 0
+
+
+def test_ttl_cache_invalidate():
+    """Test dropping entries by key predicate."""
+    cache = TTLCache()
+
+    cache.set((1, 100, "daily"), "x")
+    cache.set((2, 100, "daily"), "y")
+    cache.set((1, 200, "daily"), "z")
+    cache.invalidate(lambda key: key[1] == 100)
+
+    assert cache.get((1, 100, "daily")) is None
+    assert cache.get((2, 100, "daily")) is None
+    assert cache.get((1, 200, "daily")) == "z"
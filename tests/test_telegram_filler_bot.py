@@ -0,0 +1,86 @@
+"""Tests for the TelegramFillerBot command guards."""
+
+import asyncio
+import logging
+import os
+import tempfile
+from types import SimpleNamespace
+
+import pytest
+
+from bot import messages as M
+from bot.telegram_filler_bot import TelegramFillerBot, requires_active
+
+
+class StubMessage:
+    """Stand-in for a Telegram message that records replies."""
+
+    def __init__(self, username: str, fail: bool = False):
+        self.text = "/command"
+        self.from_user = SimpleNamespace(id=1, username=username)
+        self.replies = []
+        self._fail = fail
+
+    async def reply_text(self, text: str, **kwargs) -> None:
+        if self._fail:
+            raise RuntimeError("network down")
+        self.replies.append(text)
+
+
+def _update(username: str = "alice", fail: bool = False) -> SimpleNamespace:
+    """Build a stand-in update from a user in chat 100."""
+    return SimpleNamespace(
+        message=StubMessage(username, fail), effective_chat=SimpleNamespace(id=100)
+    )
+
+
+@pytest.fixture
+def bot():
+    """Bot with a temporary database and a single admin."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".db") as tmp_file:
+        db_path = tmp_file.name
+
+    bot = TelegramFillerBot("token", ["um"], db_path=db_path, admin_handles=["@Boss"])
+    yield bot
+    bot.database.close()
+    os.unlink(db_path)
+
+
+def test_requires_active_replies_in_inactive_chat(bot):
+    """Test that handlers don't run in inactive chats."""
+    calls = []
+
+    @requires_active
+    async def handler(self, update, context):
+        calls.append(update)
+
+    update = _update()
+    asyncio.run(handler(bot, update, None))
+    assert calls == []
+    assert update.message.replies == [M.BOT_NOT_ACTIVE]
+
+    bot.state_manager.set_active(100, True)
+    asyncio.run(handler(bot, update, None))
+    assert calls == [update]
+
+
+def test_requires_admin_rejects_non_admin(bot, caplog):
+    """Test that non-admins are refused and the attempt is logged."""
+    update = _update("alice")
+    bot.state_manager.set_active(100, True)
+    with caplog.at_level(logging.WARNING):
+        asyncio.run(bot.group_reset_command(update, None))
+
+    assert update.message.replies == [M.UNAUTHORIZED_ADMIN]
+    assert "Unauthorized group_reset attempt by user alice" in caplog.text
+
+
+def test_safe_reply_logs_failures(bot, caplog):
+    """Test that failed replies are logged instead of raised."""
+    with caplog.at_level(logging.ERROR):
+        assert asyncio.run(bot._safe_reply(_update(fail=True), "hi")) is False
+    assert "network down" in caplog.text
+
+    update = _update()
+    assert asyncio.run(bot._safe_reply(update, "hi")) is True
+    assert update.message.replies == ["hi"]